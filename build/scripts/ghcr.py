@@ -3,12 +3,33 @@
 import os
 import sys
 import argparse
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
-from typing import List, Optional, TypedDict, Callable, Protocol, Dict, Literal, Any
+from typing import Iterable, List, Optional, TypedDict, NamedTuple, Callable, Protocol, Dict, Tuple, Union, Literal, Any
 from datetime import datetime, timezone, timedelta
 import logging
 import re
+import functools
+import bisect
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional, fall back to the standard library parser
+    orjson = None
+
+# Decodes API response bodies (bytes) into Python objects
+json_loads = orjson.loads if orjson else json.loads
+
+# Extracts the URL of the rel="next" entry from a Link header (fallback for parse_next_link)
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>\s*;\s*[^,]*rel="next"')
+
+# Keep patterns that are just anchored literal prefixes, e.g. '^(latest-|git-tag-)' or '^keep-'
+_PREFIX_ALTERNATION_RE = re.compile(r"^\^(?:\(([A-Za-z0-9_-]+(?:\|[A-Za-z0-9_-]+)*)\)|([A-Za-z0-9_-]+))\Z")
 
 class AuthenticationError(Exception):
     """Raised when authentication fails"""
@@ -30,11 +51,22 @@ class PackageVersion(TypedDict):
     html_url: str
     metadata: VersionMetadata
 
-class CleanupAction(TypedDict):
+class PackageVersionRow(NamedTuple):
+    """Flattened view of a PackageVersion with the fields used to decide on cleanup"""
+    id: int
+    created_epoch: float
+    tags: List[str]
+    raw: PackageVersion
+
+class CleanupAction(NamedTuple):
+    """Decision made for a package version, compact and accessed by attribute"""
     version: PackageVersion
     action: Literal["keep", "delete"]
     reason: str
 
+# GitHub CLI command printing the token of the logged in user
+_GH_TOKEN_COMMAND = ("gh", "auth", "token")
+
 class GitHubTokenProvider:
     """
     Class responsible for retrieving and caching GitHub tokens from various sources.
@@ -79,7 +111,7 @@ class GitHubTokenProvider:
         # Method 2: GitHub CLI
         try:
             result = self._subprocess.run(
-                ["gh", "auth", "token"], 
+                _GH_TOKEN_COMMAND, 
                 capture_output=True, 
                 text=True, 
                 check=False
@@ -109,7 +141,153 @@ class GitHubTokenProvider:
 # Create a default token provider instance
 default_token_provider = GitHubTokenProvider()
 
-def list_versions(namespace: str, package_name: str, token_provider=default_token_provider, requests_module=requests) -> List[PackageVersion]:
+# Connections kept per host; concurrent removals beyond this would have their connections discarded
+HTTP_POOL_MAXSIZE = 16
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session that reuses connections to the GitHub API.
+    Transient gateway errors are retried with backoff; the final response is
+    returned as is so callers still see failures via raise_for_status().
+    Only idempotent reads are retried: a DELETE may have succeeded despite a
+    gateway error, and retrying it would report a spurious 404.
+    
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                  allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry))
+    return session
+
+# Create a default session shared by all API calls (including concurrent removals)
+default_session = create_session()
+
+# Headers sent with every GitHub API request (in addition to Authorization)
+GITHUB_API_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28"
+}
+
+# Classifies a tag, returning (is_git_commit_tag, matches_keep_pattern)
+TagClassifier = Callable[[str], Tuple[bool, bool]]
+
+@functools.lru_cache(maxsize=32)
+def _compile_tag_classifier(keep_tags_pattern: Union[str, re.Pattern]) -> TagClassifier:
+    """
+    Build a classifier that checks a tag for the git-commit-* prefix and the keep pattern at once.
+    Anchored prefix alternations such as the default '^(latest-|git-tag-)' are
+    evaluated with str.startswith. Any other pattern is compiled once and
+    searched in each tag; a precompiled pattern is used as is.
+    
+    Args:
+        keep_tags_pattern: Regex pattern (or compiled pattern) for tags to always keep regardless of age
+    
+    Returns:
+        Tag classifier (cached per pattern)
+    """
+    if isinstance(keep_tags_pattern, str):
+        prefix_match = _PREFIX_ALTERNATION_RE.match(keep_tags_pattern)
+        if prefix_match:
+            keep_prefixes = tuple((prefix_match.group(1) or prefix_match.group(2)).split("|"))
+            return lambda tag: (tag.startswith("git-commit-"), tag.startswith(keep_prefixes))
+        keep_tags_pattern = re.compile(keep_tags_pattern)
+
+    keep_search = keep_tags_pattern.search
+    return lambda tag: (tag.startswith("git-commit-"), keep_search(tag) is not None)
+
+# Keys every cached page must have to be usable
+_CACHED_PAGE_KEYS = {"etag", "next", "items"}
+
+class PageCache:
+    """
+    Class responsible for persisting API pages keyed by URL, so unchanged pages
+    can be revalidated with If-None-Match instead of being downloaded again.
+    """
+    def __init__(self, path: str):
+        """
+        Initialize the page cache.
+        
+        Args:
+            path: Path of the JSON file holding cached pages
+        """
+        self._path = path
+        self._entries = None
+    
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                with open(self._path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                # Missing, unreadable or corrupted cache, start from scratch
+                self._entries = {}
+            if not isinstance(self._entries, dict):
+                self._entries = {}
+        return self._entries
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached page for the URL (with 'etag', 'next' and 'items' keys) if any.
+        Malformed entries are ignored, so the page is fetched again.
+        """
+        page = self._load().get(url)
+        if not isinstance(page, dict) or not _CACHED_PAGE_KEYS <= page.keys() or not isinstance(page["items"], list):
+            return None
+        return page
+    
+    def put(self, url: str, etag: str, next_page: Optional[str], items: List[Any]):
+        """
+        Store a page for the URL along with its ETag and the URL of the next page.
+        """
+        self._load()[url] = {"etag": etag, "next": next_page, "items": items}
+    
+    def save(self):
+        """
+        Write the cached pages to disk.
+        Failures are logged and ignored, the cache must never block the listing.
+        """
+        if self._entries is None:
+            return
+        tmp_path = f"{self._path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logging.warning(f"Failed to save page cache to {self._path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def parse_next_link(link_header: str) -> Optional[str]:
+    """
+    Extract the URL of the rel="next" entry from a Link header.
+    
+    Args:
+        link_header: Value of the Link header, e.g. '<url2>; rel="next", <url9>; rel="last"'
+    
+    Returns:
+        URL of the next page, or None if there is no next page
+    """
+    # Find rel="next" and walk back to the <...> that precedes it, without splitting the header
+    rel_index = link_header.find('rel="next"')
+    if rel_index == -1:
+        return None
+    end = link_header.rfind('>', 0, rel_index)
+    start = link_header.rfind('<', 0, end) if end != -1 else -1
+    if start != -1:
+        return link_header[start + 1:end]
+    
+    # Unexpected layout, fall back to the regex
+    match = _LINK_NEXT_RE.search(link_header)
+    return match.group(1) if match else None
+
+def list_versions(namespace: str, package_name: str, token_provider=default_token_provider, requests_module=default_session,
+                  page_cache: Optional[PageCache] = None) -> List[PackageVersion]:
     """
     List all versions of a package in the GitHub Container Registry.
     
@@ -117,7 +295,8 @@ def list_versions(namespace: str, package_name: str, token_provider=default_toke
         namespace: The namespace in form of 'user/<username>' or 'org/<orgname>'
         package_name: The name of the package
         token_provider: Provider that returns a GitHub token (default: default_token_provider)
-        requests_module: Module to use for HTTP requests (default: requests)
+        requests_module: Module to use for HTTP requests (default: default_session)
+        page_cache: Cache used to revalidate pages with ETags (default: None, no caching)
     
     Returns:
         List of package versions with metadata
@@ -133,36 +312,59 @@ def list_versions(namespace: str, package_name: str, token_provider=default_toke
     api_url = f"https://api.github.com/{namespace}/packages/container/{package_name}/versions?per_page=100"
     
     # Set up headers with authentication
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
+    headers = {**GITHUB_API_HEADERS, "Authorization": f"Bearer {token}"}
+    
+    def fetch_page(url: str, cached_page: Optional[Dict[str, Any]]):
+        logging.info(f"Fetching versions from: {url}")
+        if cached_page:
+            return requests_module.get(url, headers={**headers, "If-None-Match": cached_page["etag"]})
+        return requests_module.get(url, headers=headers)
+    
+    def submit_page(executor: ThreadPoolExecutor, url: str):
+        cached_page = page_cache.get(url) if page_cache else None
+        return url, cached_page, executor.submit(fetch_page, url, cached_page)
     
     all_versions = []
-    next_page = api_url
-    
-    # Fetch all pages
-    while next_page:
-        logging.info(f"Fetching versions from: {next_page}")
-        response = requests_module.get(next_page, headers=headers)
-        response.raise_for_status()
-        all_versions.extend(response.json())
-        
-        # Check if there's a next page in Link header
-        next_page = None
-        if 'Link' in response.headers:
-            links = response.headers['Link'].split(',')
-            for link in links:
-                if 'rel="next"' in link:
-                    # Extract URL between < and >
-                    match = re.search(r'<([^>]+)>', link)
-                    if match:
-                        next_page = match.group(1)
+    
+    # Fetch all pages, requesting the next page while the current one is being decoded
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending_page = submit_page(executor, api_url)
+        while pending_page:
+            page_url, cached_page, future = pending_page
+            response = future.result()
+            response.raise_for_status()
+            
+            # Page didn't change since it was cached
+            if cached_page and response.status_code == 304:
+                next_page = cached_page["next"]
+                pending_page = submit_page(executor, next_page) if next_page else None
+                all_versions.extend(cached_page["items"])
+                continue
+            
+            # Check if there's a next page in Link header
+            next_page = parse_next_link(response.headers.get('Link', ''))
+            
+            pending_page = submit_page(executor, next_page) if next_page else None
+            page_versions = json_loads(response.content)
+            all_versions.extend(page_versions)
+            
+            etag = response.headers.get('ETag')
+            if page_cache and etag:
+                page_cache.put(page_url, etag, next_page, page_versions)
+    
+    if page_cache:
+        page_cache.save()
     
     return all_versions
 
-def find_versions_to_clean(versions: List[PackageVersion], tagged_max_age: int, keep_tags_pattern: str, remove_all: bool = False) -> List[CleanupAction]:
+def _parse_timestamp(value: str) -> float:
+    """
+    Parse an ISO 8601 timestamp as returned by the GitHub API into epoch seconds.
+    The trailing 'Z' is handled natively by fromisoformat (Python 3.11+).
+    """
+    return datetime.fromisoformat(value).timestamp()
+
+def find_versions_to_clean(versions: Iterable[PackageVersion], tagged_max_age: int, keep_tags_pattern: Union[str, re.Pattern], remove_all: bool = False, now: Optional[datetime] = None) -> List[CleanupAction]:
     """
     Find package versions that should be cleaned up/removed.
     Keeps tagged versions newer than 'tagged_max_age' seconds.
@@ -171,114 +373,109 @@ def find_versions_to_clean(versions: List[PackageVersion], tagged_max_age: int,
     If remove_all is True, marks all versions for deletion.
     
     Args:
-        versions: List of package versions to analyze
+        versions: Package versions to analyze, iterated only once
         tagged_max_age: Maximum age in seconds for tagged versions to keep
-        keep_tags_pattern: Regex pattern for tags to always keep regardless of age
+        keep_tags_pattern: Regex pattern (or compiled pattern) for tags to always keep regardless of age
         remove_all: If True, mark all versions for deletion (default: False)
+        now: Reference time to compute version age from (default: current UTC time)
         timestamp_tolerance_seconds: Tolerance in seconds for matching untagged to tagged timestamps
     
     Returns:
         List of cleanup actions with version, action ("keep" or "delete"), and reason
     """
-    cleanup_actions = []
-    
     # If remove_all flag is set, mark everything for deletion
     if remove_all:
-        for version in versions:
-            cleanup_actions.append({
-                "version": version,
-                "action": "delete",
-                "reason": "Marked for deletion by --all=yes-remove-all flag"
-            })
-        return cleanup_actions
-
-    # Separate versions into tagged and initially classified orphans
-    tagged_versions = []
-    potential_orphan_versions = [] # Initially includes truly untagged and git-commit-only
-
-    git_commit_regex = re.compile(r"^git-commit-")
-    timestamp_tolerance_seconds = 10 # Tolerance for timestamp matching
-    
-    for version in versions:
-        tags = version.get('metadata', {}).get('container', {}).get('tags', [])
-        has_real_tags = len(tags) > 0
+        reason = "Marked for deletion by --all=yes-remove-all flag"
+        return [CleanupAction(version, "delete", reason) for version in versions]
 
-        # Treat versions with only git-commit-* tags as untagged for initial classification
-        if has_real_tags and len(tags) == 1 and git_commit_regex.match(tags[0]):
-            has_real_tags = False
+    cleanup_actions = []
+    append_action = cleanup_actions.append # Hoisted bound method, used in the loops below
 
-        if has_real_tags:
-            tagged_versions.append(version)
-        else:
-            potential_orphan_versions.append(version)
+    timestamp_tolerance_seconds = 10 # Tolerance for timestamp matching
+    classify_tag = _compile_tag_classifier(keep_tags_pattern)
     
-    # Calculate cutoff date
-    now = datetime.now(timezone.utc)
+    # Calculate cutoff as epoch seconds
+    if now is None:
+        now = datetime.now(timezone.utc)
     tagged_max_age_delta = timedelta(seconds=tagged_max_age)
-    cutoff_date = now - tagged_max_age_delta
+    cutoff_epoch = (now - tagged_max_age_delta).timestamp()
     
-    # Initialize result list and track kept tagged versions
-    kept_tagged_versions_info = {} # Store id -> timestamp
+    older_reason = f"Tagged version older than '{tagged_max_age_delta}'"
+    newer_reason = f"Tagged version newer than '{tagged_max_age_delta}'"
+    keep_pattern_display = keep_tags_pattern.pattern if isinstance(keep_tags_pattern, re.Pattern) else keep_tags_pattern
+    keep_pattern_reason = f"Tagged version matches keep pattern '{keep_pattern_display}'"
     
-    # Compile pattern if provided
-    pattern = re.compile(keep_tags_pattern)
+    # Track kept tagged versions and orphans to be matched against them
+    kept_tagged_versions_info = {} # Store id -> epoch timestamp
+    potential_orphan_versions = [] # Includes truly untagged and git-commit-only
     
-    # Process tagged versions first to determine which ones are kept
-    for version in tagged_versions:
-        tags = version.get('metadata', {}).get('container', {}).get('tags', [])
-        created_date = datetime.fromisoformat(version['created_at'].replace('Z', '+00:00')) # Ensure timezone aware
-        
-        should_keep_due_to_pattern = False
+    # Single pass: build a typed row per version (timestamp parsed and tags looked up once),
+    # decide on tagged versions right away and set orphans aside
+    for version in versions:
+        row = PackageVersionRow(
+            id=version['id'],
+            created_epoch=_parse_timestamp(version['created_at']),
+            tags=version.get('metadata', {}).get('container', {}).get('tags', []),
+            raw=version
+        )
+        tags = row.tags
+
+        # Classify every tag with a single scan: git-commit-* and/or keep pattern match
+        matches_keep = False
+        git_commit_only = len(tags) == 1
         for tag in tags:
-            if pattern.search(tag):
-                should_keep_due_to_pattern = True
-                break
-        
+            is_git_commit, is_keep = classify_tag(tag)
+            if is_keep:
+                matches_keep = True
+            if not is_git_commit:
+                git_commit_only = False
+
+        # Treat versions with only git-commit-* tags as untagged for initial classification
+        if not tags or git_commit_only:
+            potential_orphan_versions.append(row)
+            continue
+
         action = "delete" # Default to delete
-        reason = f"Tagged version older than '{tagged_max_age_delta}'"
+        reason = older_reason
 
-        if should_keep_due_to_pattern:
+        if matches_keep:
             action = "keep"
-            reason = f"Tagged version matches keep pattern '{keep_tags_pattern}'"
-        elif created_date > cutoff_date:
+            reason = keep_pattern_reason
+        elif row.created_epoch > cutoff_epoch:
             action = "keep"
-            reason = f"Tagged version newer than '{tagged_max_age_delta}'"
+            reason = newer_reason
 
         if action == "keep":
-            kept_tagged_versions_info[version['id']] = created_date
+            kept_tagged_versions_info[row.id] = row.created_epoch
 
-        cleanup_actions.append({
-            "version": version,
-            "action": action,
-            "reason": reason
-        })
+        append_action(CleanupAction(row.raw, action, reason))
+
+    # Sort kept timestamps once so each orphan only needs to check its nearest neighbours
+    kept_ts_sorted = sorted((kept_ts, kept_id) for kept_id, kept_ts in kept_tagged_versions_info.items())
+    kept_ts_only = [ts for ts, _ in kept_ts_sorted]
 
     # Process potential orphan versions (untagged or git-commit-only)
-    for version in potential_orphan_versions:
+    for row in potential_orphan_versions:
         action = "delete"
         reason = "Orphan version"
         
-        # Check if this orphan's timestamp matches any kept tagged version's timestamp
-        orphan_created_date = datetime.fromisoformat(version['created_at'].replace('Z', '+00:00'))
-        time_tolerance = timedelta(seconds=timestamp_tolerance_seconds)
-        
-        for kept_id, kept_timestamp in kept_tagged_versions_info.items():
-            if abs(orphan_created_date - kept_timestamp) <= time_tolerance:
+        # Check if this orphan's timestamp matches the closest kept tagged version's timestamp
+        orphan_ts = row.created_epoch
+        i = bisect.bisect_left(kept_ts_only, orphan_ts)
+        neighbours = kept_ts_sorted[max(i - 1, 0):i + 1]
+        if neighbours:
+            kept_ts, kept_id = min(neighbours, key=lambda kept: abs(orphan_ts - kept[0]))
+            if abs(orphan_ts - kept_ts) <= timestamp_tolerance_seconds:
                 action = "keep"
                 reason = f"Untagged version matches timestamp of kept version {kept_id}"
-                break # Found a match, no need to check further kept versions
 
-        cleanup_actions.append({
-            "version": version,
-            "action": action,
-            "reason": reason
-        })
+        append_action(CleanupAction(row.raw, action, reason))
     
     return cleanup_actions
 
 def remove_version(namespace: str, package_name: str, version_id: int, 
                    dry_run: bool = True, token_provider=default_token_provider, 
-                   requests_module=requests) -> bool:
+                   requests_module=default_session) -> bool:
     """
     Remove a specific package version from the GitHub Container Registry.
     
@@ -288,7 +485,7 @@ def remove_version(namespace: str, package_name: str, version_id: int,
         version_id: The ID of the version to remove
         dry_run: If True, only simulate removal (default: True)
         token_provider: Provider that returns a GitHub token (default: default_token_provider)
-        requests_module: Module to use for HTTP requests
+        requests_module: Module to use for HTTP requests (default: default_session)
     
     Returns:
         True if the version was removed (or would have been in dry_run mode)
@@ -308,11 +505,7 @@ def remove_version(namespace: str, package_name: str, version_id: int,
     api_url = f"https://api.github.com/{namespace}/packages/container/{package_name}/versions/{version_id}"
     
     # Set up headers with authentication
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "Authorization": f"Bearer {token}",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
+    headers = {**GITHUB_API_HEADERS, "Authorization": f"Bearer {token}"}
     
     # Perform deletion
     response = requests_module.delete(api_url, headers=headers)
@@ -321,6 +514,46 @@ def remove_version(namespace: str, package_name: str, version_id: int,
     logging.info(f"Removed version {version_id} of {namespace}/{package_name}")
     return True
 
+def delete_package(namespace: str, package_name: str, dry_run: bool = True,
+                   token_provider=default_token_provider,
+                   requests_module=default_session) -> bool:
+    """
+    Delete a package, with all its versions, from the GitHub Container Registry.
+    
+    Args:
+        namespace: The namespace in form of 'user/<username>' or 'org/<orgname>'
+        package_name: The name of the package
+        dry_run: If True, only simulate deletion (default: True)
+        token_provider: Provider that returns a GitHub token (default: default_token_provider)
+        requests_module: Module to use for HTTP requests (default: default_session)
+    
+    Returns:
+        True if the package was deleted (or would have been in dry_run mode)
+        
+    Raises:
+        AuthenticationError: If authentication fails
+        requests.exceptions.HTTPError: If API request fails
+    """
+    if dry_run:
+        logging.info(f"[DRY RUN] Would delete package {namespace}/{package_name}")
+        return True
+    
+    # Get authentication token
+    token = token_provider.get_token()
+    
+    # Construct API URL
+    api_url = f"https://api.github.com/{namespace}/packages/container/{package_name}"
+    
+    # Set up headers with authentication
+    headers = {**GITHUB_API_HEADERS, "Authorization": f"Bearer {token}"}
+    
+    # Perform deletion
+    response = requests_module.delete(api_url, headers=headers)
+    response.raise_for_status()
+    
+    logging.info(f"Deleted package {namespace}/{package_name}")
+    return True
+
 class CleanupArgs(Protocol):
     """Type definition for cleanup command arguments."""
     namespace: str
@@ -329,11 +562,13 @@ class CleanupArgs(Protocol):
     really_remove: bool
     keep_tags_pattern: str
     all: Optional[str]
+    concurrency: int
 
 def cleanup_versions_command(args: CleanupArgs, 
                            list_versions_func: Callable[[str, str], List[PackageVersion]] = list_versions, 
-                           find_versions_func: Callable[[List[PackageVersion], int, str, bool], List[CleanupAction]] = find_versions_to_clean, 
-                           remove_version_func: Callable[[str, str, int, bool], bool] = remove_version):
+                           find_versions_func: Callable[[Iterable[PackageVersion], int, Union[str, re.Pattern], bool], List[CleanupAction]] = find_versions_to_clean, 
+                           remove_version_func: Callable[[str, str, int, bool], bool] = remove_version,
+                           delete_package_func: Callable[[str, str, bool], bool] = delete_package):
     """
     Handle the cleanup-versions command logic.
     
@@ -342,6 +577,7 @@ def cleanup_versions_command(args: CleanupArgs,
         list_versions_func: Function to list versions (default: list_versions)
         find_versions_func: Function to find versions to clean (default: find_versions_to_clean)
         remove_version_func: Function to remove a version (default: remove_version)
+        delete_package_func: Function to delete a whole package (default: delete_package)
     """
     # Determine if all versions should be removed
     should_remove_all = args.all == "yes-remove-all"
@@ -349,6 +585,13 @@ def cleanup_versions_command(args: CleanupArgs,
       logging.error("Invalid value for --all flag. Must be '--all=yes-remove-all'.")
       sys.exit(1)
     
+    # Removing everything for real takes a single call that deletes the package.
+    # Versions are only listed in dry run mode to show what would be removed.
+    if should_remove_all and args.really_remove:
+        logging.info(f"Removing all versions of {args.namespace}/{args.package} by deleting the package")
+        delete_package_func(args.namespace, args.package, dry_run=False)
+        return
+    
     # Get all versions
     all_versions = list_versions_func(args.namespace, args.package)
     
@@ -361,17 +604,18 @@ def cleanup_versions_command(args: CleanupArgs,
     )
     
     logging.info(f"Found {len(cleanup_actions)} versions from {args.namespace}/{args.package}:")
-    for action in cleanup_actions:
-      version = action["version"]
-      name_display = version['name'] if version['name'] else 'N/A'
-      tags = version['metadata']['container']['tags'] if 'container' in version['metadata'] else []
-      logging.info(f"  - ID: {version['id']}, Name: {name_display}, Tags: {', '.join(tags)}")
-      logging.info(f"    Created: {version['created_at']}")
-      logging.info(f"    Action: {action['action']}")
-      logging.info(f"    Reason: {action['reason']}")
+    if logging.getLogger().isEnabledFor(logging.INFO):
+      for action in cleanup_actions:
+        version = action.version
+        name_display = version['name'] if version['name'] else 'N/A'
+        tags = version['metadata']['container']['tags'] if 'container' in version['metadata'] else []
+        logging.info(
+          "  - ID: %d, Name: %s, Tags: %s\n    Created: %s\n    Action: %s\n    Reason: %s",
+          version['id'], name_display, ', '.join(tags), version['created_at'], action.action, action.reason
+        )
 
     # Get versions to remove (those with action="delete")
-    to_remove = [action["version"] for action in cleanup_actions if action["action"] == "delete"]
+    to_remove = [action.version for action in cleanup_actions if action.action == "delete"]
     
     # Show what would be removed
     if not to_remove:
@@ -379,9 +623,50 @@ def cleanup_versions_command(args: CleanupArgs,
         return
     
     logging.info(f"Removing {len(to_remove)} (really_remove: {args.really_remove}) versions from {args.namespace}/{args.package}:")
-    for version in to_remove:
-        remove_version_func(args.namespace, args.package, version['id'], dry_run=not args.really_remove)
-    logging.info(f"Successfully removed {len(to_remove)} versions.")
+    
+    # Removals are independent network round-trips, so overlap them.
+    # They can't be batched: the GraphQL deletePackageVersion mutation does not
+    # support the Container registry, so each version needs its own REST DELETE.
+    failed_count = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(remove_version_func, args.namespace, args.package, version['id'], dry_run=not args.really_remove): version
+            for version in to_remove
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except requests.exceptions.RequestException as e:
+                # HTTP errors as well as connection errors and timeouts left after retries
+                failed_count += 1
+                logging.error(f"Failed to remove version {futures[future]['id']}: {e}")
+    
+    removed_count = len(to_remove) - failed_count
+    if failed_count:
+        logging.error(f"Removed {removed_count} versions, failed to remove {failed_count} versions.")
+        sys.exit(1)
+    logging.info(f"Successfully removed {removed_count} versions.")
+
+def concurrency_arg(value: str) -> int:
+    """
+    Parse the --concurrency argument.
+    
+    Args:
+        value: Raw argument value
+    
+    Returns:
+        Number of parallel removals
+    
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer between 1 and HTTP_POOL_MAXSIZE
+    """
+    try:
+        concurrency = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if not 1 <= concurrency <= HTTP_POOL_MAXSIZE:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {HTTP_POOL_MAXSIZE}, got {concurrency}")
+    return concurrency
 
 def main():
     parser = argparse.ArgumentParser(description="GitHub Container Registry (GHCR) CLI Tool")
@@ -400,7 +685,14 @@ def main():
     cleanup_parser.add_argument("--really-remove", action="store_true", help="Actually perform deletion (without this flag, dry run is performed)")
     cleanup_parser.add_argument("--keep-tags-pattern", type=str, default="^(latest-|git-tag-)", 
                               help="Regex pattern for tags to always keep regardless of age (default: '^(latest-|git-tag-)')")
-    cleanup_parser.add_argument("--all", type=str, default=None, help="If set to 'yes-remove-all', ignores all other rules and removes all versions.")
+    cleanup_parser.add_argument("--all", type=str, default=None, help="If set to 'yes-remove-all', ignores all other rules and removes all versions (with --really-remove the package itself is deleted).")
+    cleanup_parser.add_argument("--concurrency", type=concurrency_arg, default=8,
+                              help=f"Number of versions to remove in parallel, from 1 to {HTTP_POOL_MAXSIZE} (default: 8)")
+    
+    for command_parser in (list_parser, cleanup_parser):
+        command_parser.add_argument("--cache-dir", type=str, default="~/.cache/ghcr-cleanup",
+                                    help="Directory to cache version pages in for ETag revalidation (default: '~/.cache/ghcr-cleanup')")
+        command_parser.add_argument("--no-cache", action="store_true", help="Always fetch version pages without using the cache")
     
     args = parser.parse_args()
     
@@ -412,21 +704,26 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    page_cache = None
+    if not args.no_cache:
+        page_cache = PageCache(os.path.join(os.path.expanduser(args.cache_dir), "etags.json"))
+    list_versions_func = functools.partial(list_versions, page_cache=page_cache)
+    
     try:
         if args.command == "list-versions":
-            versions = list_versions(args.namespace, args.package)
+            versions = list_versions_func(args.namespace, args.package)
             logging.info(f"Found {len(versions)} versions for {args.namespace}/{args.package}:")
-            for version in versions:
-                logging.info(f"  - ID: {version['id']}")
-                logging.info(f"    Name: {version['name'] if version['name'] else 'N/A'}")
-                logging.info(f"    Created: {version['created_at']}")
-                logging.info(f"    Updated: {version['updated_at']}")
-                tags = version['metadata']['container']['tags'] if 'container' in version['metadata'] else []
-                logging.info(f"    Tags: {', '.join(tags)}")
-                logging.info("")
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                for version in versions:
+                    tags = version['metadata']['container']['tags'] if 'container' in version['metadata'] else []
+                    logging.info(
+                        "  - ID: %d\n    Name: %s\n    Created: %s\n    Updated: %s\n    Tags: %s\n",
+                        version['id'], version['name'] if version['name'] else 'N/A',
+                        version['created_at'], version['updated_at'], ', '.join(tags)
+                    )
         
         elif args.command == "cleanup-versions":
-            cleanup_versions_command(args)
+            cleanup_versions_command(args, list_versions_func=list_versions_func)
     
     except Exception as e:
         logging.info(f"Command failed: {e}", file=sys.stderr)
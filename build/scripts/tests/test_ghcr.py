@@ -1,29 +1,99 @@
-import sys
 import os
-from typing import List
+import argparse
+import itertools
+import functools
+import json
+import tempfile
+from typing import Dict, Iterable, List, Set, Tuple
 import unittest
 import random
 import re
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, call, patch, create_autospec
 from faker import Faker
 from datetime import datetime, timedelta, timezone
 
 import requests
 
+# Fixed seeds keep generated test data deterministic between runs
+random.seed(0)
+Faker.seed(0)
 fake = Faker()
 
-# Add the parent directory to sys.path to import the ghcr module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+NUM_VERSIONS = 4
+
 from ghcr import (
     GitHubTokenProvider,
     list_versions, 
+    parse_next_link,
     find_versions_to_clean,
     remove_version,
+    delete_package,
+    cleanup_versions_command,
+    create_session,
+    concurrency_arg,
+    HTTP_POOL_MAXSIZE,
+    PageCache,
     AuthenticationError, 
     PackageVersion,
     CleanupAction
 )
 
+# Expected GitHub CLI invocation when falling back to `gh auth token`
+_GH_CMD = ("gh", "auth", "token")
+_GH_KW = MappingProxyType({"capture_output": True, "text": True, "check": False})
+
+# Expected API requests for the 'user/test' namespace and 'test-package' package
+_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "Authorization": "Bearer test-token",
+    "X-GitHub-Api-Version": "2022-11-28"
+}
+_PACKAGE_URL = "https://api.github.com/user/test/packages/container/test-package"
+_V1_URL = f"{_PACKAGE_URL}/versions?per_page=100"
+_V2_URL = _V1_URL.replace("per_page=100", "page=2&per_page=100")
+_EXPECTED_CALLS = [call(_V1_URL, headers=_HEADERS), call(_V2_URL, headers=_HEADERS)]
+
+# Keep tag patterns compiled once and reused across find_versions_to_clean calls
+_PATTERN_CACHE = {}
+
+def _compiled(pattern: str) -> re.Pattern:
+    if pattern not in _PATTERN_CACHE:
+        _PATTERN_CACHE[pattern] = re.compile(pattern)
+    return _PATTERN_CACHE[pattern]
+
+
+# Tags of default versions; tests that depend on tags always override metadata
+_DEFAULT_TAGS = ("tag1", "latest")
+
+def _to_iso_z(dt: datetime) -> str:
+    """Format a UTC datetime the way the GitHub API does, e.g. 2024-01-01T00:00:00Z"""
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+@functools.lru_cache(maxsize=1)
+def _default_iso_timestamp() -> str:
+    # Tests that depend on timestamps always override them
+    return _to_iso_z(fake.past_datetime())
+
+@functools.lru_cache(maxsize=1)
+def _default_uri() -> str:
+    return fake.uri()
+
+def _create_version_template() -> dict:
+    return {
+        "name": fake.name(),
+        "url": _default_uri(),
+        "package_html_url": _default_uri(),
+        "created_at": _default_iso_timestamp(),
+        "updated_at": _default_iso_timestamp(),
+        "html_url": _default_uri(),
+    }
+
+# Faker calls are comparatively slow, so random versions are drawn from a pool generated once
+_TEMPLATE_POOL = [_create_version_template() for _ in range(64)]
+
+# Unique ids, outside of the ranges tests use for explicit ids
+_version_ids = itertools.count(100000)
 
 def create_random_package_version(**overrides) -> PackageVersion:
     """
@@ -35,23 +105,38 @@ def create_random_package_version(**overrides) -> PackageVersion:
     Returns:
         A randomly generated PackageVersion object
     """
-    
-    version = {
-        "id": fake.random_int(min=1000, max=9999),
-        "name": fake.name(),
-        "url": fake.uri(),
-        "package_html_url": fake.uri(),
-        "created_at": fake.past_datetime().isoformat().replace('+00:00', 'Z'),
-        "updated_at": fake.past_datetime().isoformat().replace('+00:00', 'Z'),
-        "html_url": fake.uri(),
-        "metadata": {
-            "container": {
-                "tags": fake.words()
-            }
-        }
+    # PackageVersion is a TypedDict, so a plain dict is already the runtime type.
+    # Templates only hold immutable values, metadata is built per version so it is never shared
+    version: PackageVersion = {
+        **random.choice(_TEMPLATE_POOL),
+        "id": next(_version_ids),
+        "metadata": {"container": {"tags": list(_DEFAULT_TAGS)}},
+        **overrides
     }
-    version.update(overrides)
-    return PackageVersion(**version)
+    return version
+
+class _StubTokenProvider:
+    """Lightweight token provider returning a fixed token"""
+    def __init__(self, token: str = "test-token"):
+        self._token = token
+
+    def get_token(self) -> str:
+        return self._token
+
+def _id_of(action: CleanupAction) -> int:
+    return action.version["id"]
+
+def _actions_by_id(actions: List[CleanupAction]) -> Dict[int, CleanupAction]:
+    return dict(zip(map(_id_of, actions), actions))
+
+def _group_by_action(actions: Iterable[CleanupAction]) -> Dict[str, Tuple[Set[int], List[str]]]:
+    """Version ids and reasons of the actions grouped by action, collected in a single pass"""
+    groups: Dict[str, Tuple[Set[int], List[str]]] = {"keep": (set(), []), "delete": (set(), [])}
+    for action in actions:
+        ids, reasons = groups[action.action]
+        ids.add(action.version["id"])
+        reasons.append(action.reason)
+    return groups
 
 class TestGitHubTokenProvider(unittest.TestCase):
     def test_get_token_from_env(self):
@@ -91,12 +176,7 @@ class TestGitHubTokenProvider(unittest.TestCase):
         
         self.assertEqual(token, 'test-token-from-gh-cli')
         # Verify subprocess was called with correct arguments
-        mock_subprocess.run.assert_called_once_with(
-            ["gh", "auth", "token"],
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        mock_subprocess.run.assert_called_once_with(_GH_CMD, **_GH_KW)
         
         # Verify the token is memoized (second call doesn't call subprocess again)
         mock_subprocess.reset_mock()
@@ -176,24 +256,61 @@ class TestGitHubTokenProvider(unittest.TestCase):
         self.assertIn("Unable to retrieve GitHub token", error_message)
 
 
-class TestListVersions(unittest.TestCase):
+class TestCreateSession(unittest.TestCase):
+    def test_create_session(self):
+        """Test the session pools connections and retries transient errors"""
+        session = create_session()
+        adapter = session.get_adapter("https://api.github.com")
+
+        self.assertEqual(adapter._pool_maxsize, HTTP_POOL_MAXSIZE)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(set(adapter.max_retries.status_forcelist), {502, 503, 504})
+        self.assertTrue(adapter.max_retries.is_retry("GET", 503))
+        self.assertFalse(adapter.max_retries.is_retry("DELETE", 503))
+        self.assertFalse(adapter.max_retries.raise_on_status)
+
+
+class TestParseNextLink(unittest.TestCase):
+    def test_parse_next_link(self):
+        """Test extracting the next page URL from Link headers"""
+        self.assertEqual(
+            parse_next_link('<https://api.github.com/x?page=2>; rel="next", <https://api.github.com/x?page=9>; rel="last"'),
+            "https://api.github.com/x?page=2"
+        )
+        self.assertEqual(
+            parse_next_link('<https://api.github.com/x?page=1>; rel="prev", <https://api.github.com/x?page=3>; rel="next"'),
+            "https://api.github.com/x?page=3"
+        )
+        self.assertIsNone(parse_next_link('<https://api.github.com/x?page=1>; rel="prev"'))
+        self.assertIsNone(parse_next_link(''))
+
+
+class RequestsTestCase(unittest.TestCase):
+    """Base class sharing a single autospec'd requests session mock across tests"""
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_requests = create_autospec(requests.Session, instance=True)
+
+    def setUp(self):
+        self.mock_requests.reset_mock(return_value=True, side_effect=True)
+
+
+class TestListVersions(RequestsTestCase):
     def test_list_versions_success(self):
         """Test listing versions with successful API response"""
         # Mock token provider
-        mock_token_provider = MagicMock()
-        mock_token_provider.get_token.return_value = "test-token"
+        mock_token_provider = _StubTokenProvider()
         
         # Generate random package versions
-        num_versions = random.randint(3, 5)
-        mock_versions = [create_random_package_version() for _ in range(num_versions)]
+        mock_versions = [create_random_package_version() for _ in range(NUM_VERSIONS)]
         
         # Sample API response
         mock_response = MagicMock()
-        mock_response.json.return_value = mock_versions
+        mock_response.content = json.dumps(mock_versions).encode()
         mock_response.headers = {}  # No Link header means only one page
         
         # Mock requests module
-        mock_requests = MagicMock()
+        mock_requests = self.mock_requests
         mock_requests.get.return_value = mock_response
         
         # Call the function
@@ -205,17 +322,10 @@ class TestListVersions(unittest.TestCase):
         )
         
         # Verify API was called correctly
-        mock_requests.get.assert_called_once_with(
-            "https://api.github.com/user/test/packages/container/test-package/versions?per_page=100",
-            headers={
-                "Accept": "application/vnd.github+json",
-                "Authorization": "Bearer test-token",
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
-        )
+        mock_requests.get.assert_called_once_with(_V1_URL, headers=_HEADERS)
         
         # Verify the response was parsed correctly
-        self.assertEqual(len(result), num_versions)
+        self.assertEqual(len(result), NUM_VERSIONS)
         # Verify each result matches the original mock data
         for i, version in enumerate(result):
             self.assertEqual(version["id"], mock_versions[i]["id"])
@@ -226,8 +336,7 @@ class TestListVersions(unittest.TestCase):
     def test_list_versions_pagination(self):
         """Test listing versions with pagination"""
         # Mock token provider
-        mock_token_provider = MagicMock()
-        mock_token_provider.get_token.return_value = "test-token"
+        mock_token_provider = _StubTokenProvider()
         
         # Create mock versions for two pages
         first_page_versions = [create_random_package_version() for _ in range(3)]
@@ -235,18 +344,18 @@ class TestListVersions(unittest.TestCase):
         
         # Create mock responses for pagination
         first_response = MagicMock()
-        first_response.json.return_value = first_page_versions
+        first_response.content = json.dumps(first_page_versions).encode()
         first_response.headers = {
-            'Link': '<https://api.github.com/user/test/packages/container/test-package/versions?page=2&per_page=100>; rel="next", '
-                   '<https://api.github.com/user/test/packages/container/test-package/versions?page=199&per_page=100>; rel="last"'
+            'Link': f'<{_V2_URL}>; rel="next", '
+                    f'<{_PACKAGE_URL}/versions?page=199&per_page=100>; rel="last"'
         }
         
         second_response = MagicMock()
-        second_response.json.return_value = second_page_versions
+        second_response.content = json.dumps(second_page_versions).encode()
         second_response.headers = {} # No Link header means this is the last page
         
         # Mock requests to return different responses for different URLs
-        mock_requests = MagicMock()
+        mock_requests = self.mock_requests
         mock_requests.get.side_effect = [first_response, second_response]
         
         # Call the function
@@ -258,25 +367,7 @@ class TestListVersions(unittest.TestCase):
         )
         
         # Verify API was called for both pages
-        expected_calls = [
-            unittest.mock.call(
-                "https://api.github.com/user/test/packages/container/test-package/versions?per_page=100",
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": "Bearer test-token",
-                    "X-GitHub-Api-Version": "2022-11-28"
-                }
-            ),
-            unittest.mock.call(
-                "https://api.github.com/user/test/packages/container/test-package/versions?page=2&per_page=100",
-                headers={
-                    "Accept": "application/vnd.github+json",
-                    "Authorization": "Bearer test-token",
-                    "X-GitHub-Api-Version": "2022-11-28"
-                }
-            )
-        ]
-        mock_requests.get.assert_has_calls(expected_calls)
+        mock_requests.get.assert_has_calls(_EXPECTED_CALLS)
         
         # Verify the combined results from both pages
         self.assertEqual(len(result), 5)  # 3 from first page + 2 from second page
@@ -290,7 +381,144 @@ class TestListVersions(unittest.TestCase):
             self.assertEqual(result[i+3]["id"], second_page_versions[i]["id"])
 
 
+    def test_list_versions_with_page_cache(self):
+        """Test unchanged pages are revalidated with ETags and served from the cache"""
+        mock_token_provider = _StubTokenProvider()
+
+        first_page_versions = [create_random_package_version() for _ in range(3)]
+        second_page_versions = [create_random_package_version() for _ in range(2)]
+        first_url = _V1_URL
+        second_url = _V2_URL
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache_path = os.path.join(cache_dir, "ghcr-cleanup", "etags.json")
+
+            # First run populates the cache
+            first_response = MagicMock(status_code=200)
+            first_response.content = json.dumps(first_page_versions).encode()
+            first_response.headers = {'Link': f'<{second_url}>; rel="next"', 'ETag': '"etag-1"'}
+            second_response = MagicMock(status_code=200)
+            second_response.content = json.dumps(second_page_versions).encode()
+            second_response.headers = {'ETag': '"etag-2"'}
+            mock_requests = self.mock_requests
+            mock_requests.get.side_effect = [first_response, second_response]
+
+            list_versions(
+                namespace="user/test",
+                package_name="test-package",
+                token_provider=mock_token_provider,
+                requests_module=mock_requests,
+                page_cache=PageCache(cache_path)
+            )
+            self.assertTrue(os.path.exists(cache_path))
+
+            # Second run gets 304 for the first page and fresh data for the second one
+            not_modified_response = MagicMock(status_code=304, headers={})
+            updated_second_page_versions = [create_random_package_version() for _ in range(4)]
+            updated_second_response = MagicMock(status_code=200)
+            updated_second_response.content = json.dumps(updated_second_page_versions).encode()
+            updated_second_response.headers = {'ETag': '"etag-3"'}
+            mock_requests.reset_mock(return_value=True, side_effect=True)
+            mock_requests.get.side_effect = [not_modified_response, updated_second_response]
+
+            result = list_versions(
+                namespace="user/test",
+                package_name="test-package",
+                token_provider=mock_token_provider,
+                requests_module=mock_requests,
+                page_cache=PageCache(cache_path)
+            )
+
+            mock_requests.get.assert_has_calls([
+                call(first_url, headers={**_HEADERS, "If-None-Match": '"etag-1"'}),
+                call(second_url, headers={**_HEADERS, "If-None-Match": '"etag-2"'}),
+            ])
+            self.assertEqual(
+                [v["id"] for v in result],
+                [v["id"] for v in first_page_versions + updated_second_page_versions]
+            )
+            self.assertEqual(PageCache(cache_path).get(second_url)["etag"], '"etag-3"')
+
+    def test_list_versions_with_unwritable_page_cache(self):
+        """Test failing to save the page cache does not fail the listing"""
+        versions = [create_random_package_version() for _ in range(2)]
+        response = MagicMock(status_code=200)
+        response.content = json.dumps(versions).encode()
+        response.headers = {'ETag': '"etag-1"'}
+        mock_requests = self.mock_requests
+        mock_requests.get.return_value = response
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # A regular file where the cache directory should be makes saving fail
+            blocker_path = os.path.join(cache_dir, "ghcr-cleanup")
+            open(blocker_path, "w").close()
+
+            with self.assertLogs(level="WARNING"):
+                result = list_versions(
+                    namespace="user/test",
+                    package_name="test-package",
+                    token_provider=_StubTokenProvider(),
+                    requests_module=mock_requests,
+                    page_cache=PageCache(os.path.join(blocker_path, "etags.json"))
+                )
+
+        self.assertEqual([v["id"] for v in result], [v["id"] for v in versions])
+
+    def test_page_cache_save_failure_removes_temp_file(self):
+        """Test a failed page cache save does not leave the temporary file behind"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # A directory at the cache file path makes replacing it with the temporary file fail
+            cache_path = os.path.join(cache_dir, "etags.json")
+            os.mkdir(cache_path)
+            page_cache = PageCache(cache_path)
+            page_cache.put(_V1_URL, '"etag-1"', None, [])
+
+            with self.assertLogs(level="WARNING"):
+                page_cache.save()
+
+            self.assertFalse(os.path.exists(f"{cache_path}.tmp"))
+
+    def test_list_versions_with_malformed_page_cache(self):
+        """Test malformed page cache contents are ignored and pages are fetched again"""
+        versions = [create_random_package_version() for _ in range(2)]
+        response = MagicMock(status_code=200)
+        response.content = json.dumps(versions).encode()
+        response.headers = {}
+        mock_requests = self.mock_requests
+
+        malformed_contents = [
+            [],
+            {_V1_URL: "not-a-page"},
+            {_V1_URL: {"next": None, "items": []}},
+            {_V1_URL: {"etag": '"etag-1"', "next": None}},
+            {_V1_URL: {"etag": '"etag-1"', "items": []}},
+        ]
+        for contents in malformed_contents:
+            with self.subTest(contents=contents), tempfile.TemporaryDirectory() as cache_dir:
+                cache_path = os.path.join(cache_dir, "etags.json")
+                with open(cache_path, "w") as f:
+                    json.dump(contents, f)
+                mock_requests.reset_mock(return_value=True, side_effect=True)
+                mock_requests.get.return_value = response
+
+                result = list_versions(
+                    namespace="user/test",
+                    package_name="test-package",
+                    token_provider=_StubTokenProvider(),
+                    requests_module=mock_requests,
+                    page_cache=PageCache(cache_path)
+                )
+
+                mock_requests.get.assert_called_once_with(_V1_URL, headers=_HEADERS)
+                self.assertEqual([v["id"] for v in result], [v["id"] for v in versions])
+
+
 class TestFindVersionsToClean(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Fixed reference instant so version ages don't depend on the wall clock
+        cls.NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
     def test_empty_versions_list(self):
         """Test with an empty list of versions"""
         cleanup_actions = find_versions_to_clean(versions=[], tagged_max_age=0, keep_tags_pattern="^test-pattern-", remove_all=False)
@@ -298,7 +526,7 @@ class TestFindVersionsToClean(unittest.TestCase):
     
     def test_find_untagged_versions(self):
         """Test finding versions with no tags"""
-        created_at = fake.past_datetime(tzinfo=timezone.utc)
+        created_at = self.NOW - timedelta(days=10)
         tagged_created_at_iso = created_at.isoformat()
         orphan_created_at_iso = (created_at - timedelta(days=1)).isoformat()
         with_tags = [
@@ -312,26 +540,26 @@ class TestFindVersionsToClean(unittest.TestCase):
         ]
         
         cleanup_actions = find_versions_to_clean(
-            versions = with_tags + without_tags,
-            tagged_max_age=datetime.now().timestamp() - created_at.timestamp() + 1,
+            versions = itertools.chain(with_tags, without_tags),
+            tagged_max_age=self.NOW.timestamp() - created_at.timestamp() + 1,
             keep_tags_pattern="^preserve-",  # Different pattern
-            remove_all=False
+            remove_all=False,
+            now=self.NOW
         )
         
         # All untagged versions should be marked for deletion
         self.assertEqual(len(cleanup_actions), len(with_tags) + len(without_tags))
 
-        to_remove = [action for action in cleanup_actions if action["action"] == "delete"]
-        self.assertEqual({a["version"]["id"] for a in to_remove}, {a["id"] for a in without_tags})
+        removed_ids, remove_reasons = _group_by_action(cleanup_actions)["delete"]
+        self.assertEqual(removed_ids, {a["id"] for a in without_tags})
         
         # Verify the reason for deletion
-        for action in cleanup_actions:
-            if action["action"] == "delete":
-                self.assertEqual(action["reason"], "Orphan version")
+        for reason in remove_reasons:
+            self.assertEqual(reason, "Orphan version")
     
     def test_find_versions_with_git_commit_only(self):
         """Test finding versions with git commit only"""
-        created_at = fake.past_datetime(tzinfo=timezone.utc)
+        created_at = self.NOW - timedelta(days=10)
         tagged_created_at_iso = created_at.isoformat()
         orphan_created_at_iso = (created_at - timedelta(days=1)).isoformat()
         git_commit_orphan_created_at_iso = (created_at - timedelta(days=2)).isoformat()
@@ -351,129 +579,199 @@ class TestFindVersionsToClean(unittest.TestCase):
         ]
         
         cleanup_actions = find_versions_to_clean(
-            versions = with_tags + without_tags + with_git_commit_only_tags,
-            tagged_max_age=datetime.now().timestamp() - created_at.timestamp() + 1,
+            versions = itertools.chain(with_tags, without_tags, with_git_commit_only_tags),
+            tagged_max_age=self.NOW.timestamp() - created_at.timestamp() + 1,
             keep_tags_pattern="^preserve-",  # Different pattern
-            remove_all=False
+            remove_all=False,
+            now=self.NOW
         )
         
         # All untagged versions should be marked for deletion
         self.assertEqual(len(cleanup_actions), len(with_tags) + len(without_tags) + len(with_git_commit_only_tags))
 
-        to_remove = [action for action in cleanup_actions if action["action"] == "delete"]
-        self.assertEqual({a["version"]["id"] for a in to_remove}, {a["id"] for a in (without_tags + with_git_commit_only_tags)})
+        removed_ids, remove_reasons = _group_by_action(cleanup_actions)["delete"]
+        self.assertEqual(removed_ids, {a["id"] for a in (without_tags + with_git_commit_only_tags)})
         
         # Verify the reason for deletion
-        for action in cleanup_actions:
-            if action["action"] == "delete":
-                self.assertEqual(action["reason"], "Orphan version")
+        for reason in remove_reasons:
+            self.assertEqual(reason, "Orphan version")
 
     def test_delete_old_tagged_versions(self):
         """Test to delete old tagged versions"""
-        now = datetime.now(timezone.utc)
-        base_past = fake.past_datetime(tzinfo=timezone.utc)
+        now = self.NOW
+        base_past = now - timedelta(days=10)
         
-        older_versions = []
-        for i in range(4):
-            version = create_random_package_version(
+        older_versions = [
+            create_random_package_version(
                 id=1000 + i,
-                created_at=(base_past - timedelta(hours=i*5) - timedelta(seconds=1)).isoformat()
+                created_at=(base_past - timedelta(hours=i*5, seconds=1)).isoformat()
             )
-            older_versions.append(version)
+            for i in range(4)
+        ]
         
-        newer_versions = []
-        for i in range(6):
-            version = create_random_package_version(
+        newer_versions = [
+            create_random_package_version(
                 id=2000 + i,
-                created_at=(base_past + timedelta(hours=i*5) + timedelta(seconds=1)).isoformat()
+                created_at=(base_past + timedelta(hours=i*5, seconds=1)).isoformat()
             )
-            newer_versions.append(version)
+            for i in range(6)
+        ]
         
         cleanup_actions = find_versions_to_clean(
-            versions = older_versions + newer_versions,
+            versions = itertools.chain(older_versions, newer_versions),
             tagged_max_age=now.timestamp() - base_past.timestamp(),
             keep_tags_pattern="^keep-me-",  # Different pattern
-            remove_all=False
+            remove_all=False,
+            now=self.NOW
         )
         
-        to_remove = [action for action in cleanup_actions if action["action"] == "delete"]
-        to_keep = [action for action in cleanup_actions if action["action"] == "keep"]
+        groups = _group_by_action(cleanup_actions)
+        kept_ids, keep_reasons = groups["keep"]
+        removed_ids, remove_reasons = groups["delete"]
         
-        self.assertEqual(len(to_remove), len(older_versions))
-        self.assertEqual(len(to_keep), len(newer_versions))
+        self.assertEqual(len(remove_reasons), len(older_versions))
+        self.assertEqual(len(keep_reasons), len(newer_versions))
         
-        kept_ids = {v["version"]['id'] for v in to_keep}
         self.assertEqual(kept_ids, {v["id"] for v in newer_versions})
-
-        removed_ids = {v["version"]['id'] for v in to_remove}
         self.assertEqual(removed_ids, {v["id"] for v in older_versions})
         
-        for action in to_keep:
-            self.assertIn("Tagged version newer than", action["reason"])
+        for reason in keep_reasons:
+            self.assertIn("Tagged version newer than", reason)
 
-        for action in to_remove:
-            self.assertIn("Tagged version older than", action["reason"])
+        for reason in remove_reasons:
+            self.assertIn("Tagged version older than", reason)
     
     def test_keep_versions_matching_pattern(self):
         """Test keeping versions with tags matching pattern regardless of age"""
-        now = datetime.now(timezone.utc)
+        now = self.NOW
         old_date = (now - timedelta(days=30)).isoformat()
         test_pattern = "^(archive-|stable-)"
         
-        old_matching_versions = []
-        for i in range(3):
-            version = create_random_package_version(
+        old_matching_versions = [
+            create_random_package_version(
                 id=1000 + i,
                 created_at=old_date,
                 metadata={"container": {"tags": [f"archive-{i}", f"other-{i}"]}}
             )
-            old_matching_versions.append(version)
-            
-        for i in range(3):
-            version = create_random_package_version(
+            for i in range(3)
+        ] + [
+            create_random_package_version(
                 id=2000 + i,
                 created_at=old_date,
                 metadata={"container": {"tags": [f"stable-v1.{i}.0", f"other-{i}"]}}
             )
-            old_matching_versions.append(version)
+            for i in range(3)
+        ]
 
-        old_not_matching_versions = []
-        for i in range(4):
-            version = create_random_package_version(
+        old_not_matching_versions = [
+            create_random_package_version(
                 id=3000 + i,
                 created_at=old_date,
                 metadata={"container": {"tags": [f"v1.{i}.0", f"latest-{i}"]}}
             )
-            old_not_matching_versions.append(version)
-        
-        cleanup_actions = find_versions_to_clean(
-            versions=old_matching_versions + old_not_matching_versions,
-            tagged_max_age=60 * 60 * 24 * 7,  # 7 days
-            keep_tags_pattern=test_pattern,
-            remove_all=False
-        )
-        
-        to_keep = [action for action in cleanup_actions if action["action"] == "keep"]
-        to_remove = [action for action in cleanup_actions if action["action"] == "delete"]
-        
-        self.assertEqual(len(to_keep), len(old_matching_versions))
-        self.assertEqual(len(to_remove), len(old_not_matching_versions))
+            for i in range(4)
+        ]
         
-        kept_ids = {action["version"]["id"] for action in to_keep}
         expected_kept_ids = {v["id"] for v in old_matching_versions}
-        self.assertEqual(kept_ids, expected_kept_ids)
-
-        deleted_ids = {action["version"]["id"] for action in to_remove}
         expected_deleted_ids = {v["id"] for v in old_not_matching_versions}
-        self.assertEqual(deleted_ids, expected_deleted_ids)
-        
-        for action in to_keep:
-            self.assertIn("Tagged version matches keep pattern", action["reason"])
-            self.assertIn(test_pattern, action["reason"])
+
+        # The CLI passes the pattern as a string, callers may also pass it precompiled
+        for keep_tags_pattern in (test_pattern, _compiled(test_pattern)):
+            with self.subTest(keep_tags_pattern=keep_tags_pattern):
+                cleanup_actions = find_versions_to_clean(
+                    versions=itertools.chain(old_matching_versions, old_not_matching_versions),
+                    tagged_max_age=60 * 60 * 24 * 7,  # 7 days
+                    keep_tags_pattern=keep_tags_pattern,
+                    remove_all=False,
+                    now=self.NOW
+                )
+                
+                groups = _group_by_action(cleanup_actions)
+                kept_ids, keep_reasons = groups["keep"]
+                deleted_ids, delete_reasons = groups["delete"]
+                
+                self.assertEqual(len(keep_reasons), len(old_matching_versions))
+                self.assertEqual(len(delete_reasons), len(old_not_matching_versions))
+                self.assertEqual(kept_ids, expected_kept_ids)
+                self.assertEqual(deleted_ids, expected_deleted_ids)
+                
+                for reason in keep_reasons:
+                    self.assertIn("Tagged version matches keep pattern", reason)
+                    self.assertIn(test_pattern, reason)
+
+    def test_keep_versions_matching_regex_pattern(self):
+        """Test keeping versions with tags matching a pattern that is not a plain prefix"""
+        now = self.NOW
+        old_date = (now - timedelta(days=30)).isoformat()
+        test_pattern = r"-rc\d+$"
+
+        old_matching_versions = [
+            create_random_package_version(id=1000 + i, created_at=old_date, metadata={"container": {"tags": [f"v1.{i}.0-rc{i}"]}})
+            for i in range(3)
+        ]
+        old_not_matching_versions = [
+            create_random_package_version(id=2000 + i, created_at=old_date, metadata={"container": {"tags": [f"v1.{i}.0-rc{i}-debug", f"rc{i}"]}})
+            for i in range(3)
+        ]
+
+        for keep_tags_pattern in (test_pattern, _compiled(test_pattern)):
+            with self.subTest(keep_tags_pattern=keep_tags_pattern):
+                cleanup_actions = find_versions_to_clean(
+                    versions=itertools.chain(old_matching_versions, old_not_matching_versions),
+                    tagged_max_age=60 * 60 * 24 * 7,  # 7 days
+                    keep_tags_pattern=keep_tags_pattern,
+                    remove_all=False,
+                    now=self.NOW
+                )
+
+                groups = _group_by_action(cleanup_actions)
+                kept_ids, _ = groups["keep"]
+                deleted_ids, _ = groups["delete"]
+                self.assertEqual(kept_ids, {v["id"] for v in old_matching_versions})
+                self.assertEqual(deleted_ids, {v["id"] for v in old_not_matching_versions})
+
+    def test_keep_pattern_with_trailing_newline_is_not_a_prefix(self):
+        """Test a prefix-like keep pattern ending with a newline only matches tags containing it"""
+        old_date = (self.NOW - timedelta(days=30)).isoformat()
+        versions = [create_random_package_version(id=1001, created_at=old_date, metadata={"container": {"tags": ["keep-x"]}})]
+
+        for test_pattern in ("^keep-\n", "^(keep-|stable-)\n"):
+            with self.subTest(pattern=test_pattern):
+                cleanup_actions = find_versions_to_clean(
+                    versions=versions,
+                    tagged_max_age=60 * 60 * 24 * 7,  # 7 days
+                    keep_tags_pattern=test_pattern,
+                    remove_all=False,
+                    now=self.NOW
+                )
+
+                self.assertEqual(cleanup_actions[0].action, "delete")
+
+    def test_keep_versions_matching_pattern_with_groups(self):
+        """Test keep patterns using backreferences and named groups keep their meaning"""
+        old_date = (self.NOW - timedelta(days=30)).isoformat()
+        versions = [
+            create_random_package_version(id=1001, created_at=old_date, metadata={"container": {"tags": ["aa-1"]}}),
+            create_random_package_version(id=1002, created_at=old_date, metadata={"container": {"tags": ["ab-1"]}}),
+        ]
+
+        for test_pattern in (r"^(a)\1-", r"^(?P<keep>a)(?P=keep)-", r"^(?P<gc>a)(?P=gc)-"):
+            with self.subTest(pattern=test_pattern):
+                cleanup_actions = find_versions_to_clean(
+                    versions=versions,
+                    tagged_max_age=60 * 60 * 24 * 7,  # 7 days
+                    keep_tags_pattern=test_pattern,
+                    remove_all=False,
+                    now=self.NOW
+                )
+
+                actions_by_id = _actions_by_id(cleanup_actions)
+                self.assertEqual(actions_by_id[1001].action, "keep")
+                self.assertEqual(actions_by_id[1002].action, "delete")
 
     def test_keep_untagged_matching_timestamp(self):
         """Test keeping untagged versions if timestamp matches a kept tagged version"""
-        now = datetime.now(timezone.utc)
+        now = self.NOW
         shared_timestamp = (now - timedelta(days=1))
         shared_timestamp_iso = shared_timestamp.isoformat()
         
@@ -526,34 +824,72 @@ class TestFindVersionsToClean(unittest.TestCase):
             versions=versions,
             tagged_max_age=60 * 60 * 24 * 2, 
             keep_tags_pattern="^never-match-",
-            remove_all=False
+            remove_all=False,
+            now=self.NOW
         )
 
         self.assertEqual(len(cleanup_actions), 5)
 
-        actions_by_id = {action["version"]["id"]: action for action in cleanup_actions}
+        actions_by_id = _actions_by_id(cleanup_actions)
 
         # Check manifest list (kept because recent)
-        self.assertEqual(actions_by_id[1001]["action"], "keep")
-        self.assertIn("Tagged version newer than", actions_by_id[1001]["reason"])
+        self.assertEqual(actions_by_id[1001].action, "keep")
+        self.assertIn("Tagged version newer than", actions_by_id[1001].reason)
 
         # Check orphans with matching timestamp (kept due to correlation)
-        self.assertEqual(actions_by_id[2001]["action"], "keep")
-        self.assertEqual(actions_by_id[2001]["reason"], f"Untagged version matches timestamp of kept version {manifest_list['id']}")
-        self.assertEqual(actions_by_id[2002]["action"], "keep")
-        self.assertEqual(actions_by_id[2002]["reason"], f"Untagged version matches timestamp of kept version {manifest_list['id']}")
+        self.assertEqual(actions_by_id[2001].action, "keep")
+        self.assertEqual(actions_by_id[2001].reason, f"Untagged version matches timestamp of kept version {manifest_list['id']}")
+        self.assertEqual(actions_by_id[2002].action, "keep")
+        self.assertEqual(actions_by_id[2002].reason, f"Untagged version matches timestamp of kept version {manifest_list['id']}")
 
         # Check unrelated orphan (deleted)
-        self.assertEqual(actions_by_id[3001]["action"], "delete")
-        self.assertEqual(actions_by_id[3001]["reason"], "Orphan version")
+        self.assertEqual(actions_by_id[3001].action, "delete")
+        self.assertEqual(actions_by_id[3001].reason, "Orphan version")
         
         # Check git-commit only orphan (deleted)
-        self.assertEqual(actions_by_id[3002]["action"], "delete")
-        self.assertEqual(actions_by_id[3002]["reason"], "Orphan version")
+        self.assertEqual(actions_by_id[3002].action, "delete")
+        self.assertEqual(actions_by_id[3002].reason, "Orphan version")
+
+    def test_keep_untagged_matching_nearest_timestamp(self):
+        """Test untagged versions are matched against the closest kept tagged version"""
+        now = self.NOW
+        kept_timestamps = [now - timedelta(hours=i) for i in range(1, 6)]
+        kept_versions = [
+            create_random_package_version(id=1000 + i, created_at=ts.isoformat(), metadata={"container": {"tags": [f"v{i}"]}})
+            for i, ts in enumerate(kept_timestamps)
+        ]
+
+        orphans = [
+            # Just before the newest kept version
+            create_random_package_version(id=2000, created_at=(kept_timestamps[0] - timedelta(seconds=4)).isoformat(), metadata={"container": {"tags": []}}),
+            # Just after a kept version in the middle
+            create_random_package_version(id=2001, created_at=(kept_timestamps[2] + timedelta(seconds=9)).isoformat(), metadata={"container": {"tags": []}}),
+            # Between kept versions, outside of tolerance
+            create_random_package_version(id=2002, created_at=(kept_timestamps[3] + timedelta(minutes=30)).isoformat(), metadata={"container": {"tags": []}}),
+            # Older than all kept versions, outside of tolerance
+            create_random_package_version(id=2003, created_at=(kept_timestamps[4] - timedelta(seconds=11)).isoformat(), metadata={"container": {"tags": []}}),
+        ]
+
+        cleanup_actions = find_versions_to_clean(
+            versions=itertools.chain(kept_versions, orphans),
+            tagged_max_age=60 * 60 * 24,
+            keep_tags_pattern="^never-match-",
+            remove_all=False,
+            now=self.NOW
+        )
+
+        actions_by_id = _actions_by_id(cleanup_actions)
+
+        self.assertEqual(actions_by_id[2000].action, "keep")
+        self.assertEqual(actions_by_id[2000].reason, "Untagged version matches timestamp of kept version 1000")
+        self.assertEqual(actions_by_id[2001].action, "keep")
+        self.assertEqual(actions_by_id[2001].reason, "Untagged version matches timestamp of kept version 1002")
+        self.assertEqual(actions_by_id[2002].action, "delete")
+        self.assertEqual(actions_by_id[2003].action, "delete")
 
     def test_remove_all_versions(self):
         """Test the remove_all=True flag marks all versions for deletion"""
-        now = datetime.now(timezone.utc)
+        now = self.NOW
         
         # Create a diverse set of versions
         versions = [
@@ -580,18 +916,17 @@ class TestFindVersionsToClean(unittest.TestCase):
         self.assertEqual(len(cleanup_actions), len(versions))
         
         for action in cleanup_actions:
-            self.assertEqual(action["action"], "delete")
-            self.assertEqual(action["reason"], "Marked for deletion by --all=yes-remove-all flag")
+            self.assertEqual(action.action, "delete")
+            self.assertEqual(action.reason, "Marked for deletion by --all=yes-remove-all flag")
 
-class TestRemoveVersion(unittest.TestCase):
+class TestRemoveVersion(RequestsTestCase):
     def test_remove_version_dry_run(self):
         """Test removing a version in dry run mode"""
         # Mock token provider
-        mock_token_provider = MagicMock()
-        mock_token_provider.get_token.return_value = "test-token"
+        mock_token_provider = _StubTokenProvider()
         
         # Mock requests module
-        mock_requests = MagicMock()
+        mock_requests = self.mock_requests
         
         # Call remove_version with dry_run=True
         result = remove_version(
@@ -612,12 +947,11 @@ class TestRemoveVersion(unittest.TestCase):
     def test_remove_version_actual(self):
         """Test removing a version for real"""
         # Mock token provider
-        mock_token_provider = MagicMock()
-        mock_token_provider.get_token.return_value = "test-token"
+        mock_token_provider = _StubTokenProvider()
         
         # Mock requests module
         mock_response = MagicMock()
-        mock_requests = MagicMock()
+        mock_requests = self.mock_requests
         mock_requests.delete.return_value = mock_response
         
         # Call remove_version with dry_run=False
@@ -634,25 +968,17 @@ class TestRemoveVersion(unittest.TestCase):
         self.assertTrue(result)
         
         # Verify API was called correctly
-        mock_requests.delete.assert_called_once_with(
-            "https://api.github.com/user/test/packages/container/test-package/versions/1234",
-            headers={
-                "Accept": "application/vnd.github+json",
-                "Authorization": "Bearer test-token",
-                "X-GitHub-Api-Version": "2022-11-28"
-            }
-        )
+        mock_requests.delete.assert_called_once_with(f"{_PACKAGE_URL}/versions/1234", headers=_HEADERS)
         
     def test_remove_version_error(self):
         """Test error handling when removing a version"""
         # Mock token provider
-        mock_token_provider = MagicMock()
-        mock_token_provider.get_token.return_value = "test-token"
+        mock_token_provider = _StubTokenProvider()
         
         # Mock requests module with an error response
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("API Error")
-        mock_requests = MagicMock()
+        mock_requests = self.mock_requests
         mock_requests.delete.return_value = mock_response
         
         # Call remove_version with dry_run=False
@@ -666,5 +992,149 @@ class TestRemoveVersion(unittest.TestCase):
                 requests_module=mock_requests
             )
 
+class TestDeletePackage(RequestsTestCase):
+    def test_delete_package_dry_run(self):
+        """Test deleting a package in dry run mode"""
+        mock_token_provider = _StubTokenProvider()
+        mock_requests = self.mock_requests
+
+        result = delete_package(
+            namespace="user/test",
+            package_name="test-package",
+            dry_run=True,
+            token_provider=mock_token_provider,
+            requests_module=mock_requests
+        )
+
+        self.assertTrue(result)
+        mock_requests.delete.assert_not_called()
+
+    def test_delete_package_actual(self):
+        """Test deleting a package for real"""
+        mock_token_provider = _StubTokenProvider()
+        mock_requests = self.mock_requests
+        mock_requests.delete.return_value = MagicMock()
+
+        result = delete_package(
+            namespace="user/test",
+            package_name="test-package",
+            dry_run=False,
+            token_provider=mock_token_provider,
+            requests_module=mock_requests
+        )
+
+        self.assertTrue(result)
+        mock_requests.delete.assert_called_once_with(_PACKAGE_URL, headers=_HEADERS)
+
+
+class TestConcurrencyArg(unittest.TestCase):
+    def test_concurrency_arg(self):
+        """Test --concurrency accepts values from 1 up to the connection pool size"""
+        self.assertEqual(concurrency_arg("1"), 1)
+        self.assertEqual(concurrency_arg(str(HTTP_POOL_MAXSIZE)), HTTP_POOL_MAXSIZE)
+        for value in ("0", "-1", str(HTTP_POOL_MAXSIZE + 1), "many"):
+            with self.subTest(value=value), self.assertRaises(argparse.ArgumentTypeError):
+                concurrency_arg(value)
+
+
+class TestCleanupVersionsCommand(unittest.TestCase):
+    def create_args(self, **overrides):
+        args = {
+            "namespace": "user/test",
+            "package": "test-package",
+            "tagged_max_age": 60 * 60 * 24 * 7,
+            "really_remove": True,
+            "keep_tags_pattern": "^keep-me-",
+            "all": None,
+            "concurrency": 4,
+        }
+        args.update(overrides)
+        return SimpleNamespace(**args)
+
+    def test_remove_versions_concurrently(self):
+        """Test all versions marked for deletion are removed"""
+        versions = [create_random_package_version(id=1000 + i) for i in range(10)]
+        cleanup_actions = [
+            CleanupAction(version, "delete", "Orphan version")
+            for version in versions
+        ]
+        mock_remove_version = MagicMock(return_value=True)
+
+        cleanup_versions_command(
+            self.create_args(),
+            list_versions_func=MagicMock(return_value=versions),
+            find_versions_func=MagicMock(return_value=cleanup_actions),
+            remove_version_func=mock_remove_version
+        )
+
+        self.assertEqual(mock_remove_version.call_count, len(versions))
+        removed_ids = {c.args[2] for c in mock_remove_version.call_args_list}
+        self.assertEqual(removed_ids, {v["id"] for v in versions})
+        for c in mock_remove_version.call_args_list:
+            self.assertEqual(c.kwargs, {"dry_run": False})
+
+    def test_remove_versions_partial_failure(self):
+        """Test failed removals do not stop the others and are reported"""
+        versions = [create_random_package_version(id=1000 + i) for i in range(5)]
+        cleanup_actions = [
+            CleanupAction(version, "delete", "Orphan version")
+            for version in versions
+        ]
+
+        def remove_version_func(namespace, package_name, version_id, dry_run):
+            if version_id == 1002:
+                raise requests.exceptions.HTTPError("API Error")
+            if version_id == 1004:
+                raise requests.exceptions.ConnectionError("Connection reset")
+            return True
+        mock_remove_version = MagicMock(side_effect=remove_version_func)
+
+        with self.assertRaises(SystemExit) as context, self.assertLogs(level="ERROR") as logs:
+            cleanup_versions_command(
+                self.create_args(),
+                list_versions_func=MagicMock(return_value=versions),
+                find_versions_func=MagicMock(return_value=cleanup_actions),
+                remove_version_func=mock_remove_version
+            )
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertEqual(mock_remove_version.call_count, len(versions))
+        self.assertIn("Removed 3 versions, failed to remove 2 versions.", logs.output[-1])
+
+    def test_remove_all_deletes_package(self):
+        """Test --all=yes-remove-all with --really-remove deletes the package without listing versions"""
+        mock_list_versions = MagicMock()
+        mock_remove_version = MagicMock()
+        mock_delete_package = MagicMock(return_value=True)
+
+        cleanup_versions_command(
+            self.create_args(all="yes-remove-all"),
+            list_versions_func=mock_list_versions,
+            remove_version_func=mock_remove_version,
+            delete_package_func=mock_delete_package
+        )
+
+        mock_delete_package.assert_called_once_with("user/test", "test-package", dry_run=False)
+        mock_list_versions.assert_not_called()
+        mock_remove_version.assert_not_called()
+
+    def test_remove_all_dry_run_lists_versions(self):
+        """Test --all=yes-remove-all without --really-remove still lists what would be removed"""
+        versions = [create_random_package_version(id=1000 + i) for i in range(3)]
+        mock_remove_version = MagicMock(return_value=True)
+        mock_delete_package = MagicMock()
+
+        cleanup_versions_command(
+            self.create_args(all="yes-remove-all", really_remove=False),
+            list_versions_func=MagicMock(return_value=versions),
+            remove_version_func=mock_remove_version,
+            delete_package_func=mock_delete_package
+        )
+
+        mock_delete_package.assert_not_called()
+        self.assertEqual(mock_remove_version.call_count, len(versions))
+        for c in mock_remove_version.call_args_list:
+            self.assertEqual(c.kwargs, {"dry_run": True})
+
 if __name__ == "__main__":
     unittest.main()